@@ -3,7 +3,13 @@
 import json
 import os
 from dataclasses import dataclass, asdict
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # Default values
@@ -13,6 +19,24 @@ MIN_REFRESH_INTERVAL = 10
 MAX_REFRESH_INTERVAL = 300
 
 
+def _loads(raw: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=4).encode()
+
+
+# Parsed configs keyed by absolute path -> (mtime_ns, size, config)
+_CONFIG_CACHE: Dict[str, Tuple[int, int, 'WidgetConfig']] = {}
+
+
 @dataclass
 class WidgetConfig:
     """Configuration for the AWS Cost Widget."""
@@ -38,53 +62,90 @@ def validate_refresh_interval(interval: int) -> int:
     return max(MIN_REFRESH_INTERVAL, min(MAX_REFRESH_INTERVAL, interval))
 
 
+def _load_config_from_str(raw) -> WidgetConfig:
+    """
+    Build a WidgetConfig from JSON text, falling back to defaults.
+    
+    Args:
+        raw: JSON document as str or bytes
+        
+    Returns:
+        WidgetConfig with parsed or default values
+    """
+    config = WidgetConfig()
+    
+    try:
+        data = _loads(raw)
+    except ValueError:
+        # Return defaults on parse error
+        return config
+    
+    # Load budget with validation
+    if 'budget' in data:
+        try:
+            budget = float(data['budget'])
+            if budget > 0:
+                config.budget = budget
+        except (ValueError, TypeError):
+            pass  # Use default
+    
+    # Load refresh interval with validation
+    if 'refresh_interval' in data:
+        try:
+            interval = int(data['refresh_interval'])
+            config.refresh_interval = validate_refresh_interval(interval)
+        except (ValueError, TypeError):
+            pass  # Use default
+    
+    # Load simulated data flag
+    if 'use_simulated_data' in data:
+        config.use_simulated_data = bool(data['use_simulated_data'])
+    
+    return config
+
+
+def _save_config_to_str(config: WidgetConfig) -> str:
+    """Serialize a WidgetConfig to the JSON text written by save_config."""
+    return _dumps(config.to_dict()).decode()
+
+
 def load_config(config_path: str = "config.json") -> WidgetConfig:
     """
     Load configuration from JSON file, falling back to defaults.
     
+    Parsed results are cached per path and reused until the file's
+    mtime or size changes.
+    
     Args:
         config_path: Path to the configuration file
         
     Returns:
         WidgetConfig with loaded or default values
     """
-    config = WidgetConfig()
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return WidgetConfig()
     
-    if not os.path.exists(config_path):
-        return config
+    cache_key = os.path.abspath(config_path)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
     
     try:
-        with open(config_path, 'r') as f:
-            data = json.load(f)
-        
-        # Load budget with validation
-        if 'budget' in data:
-            try:
-                budget = float(data['budget'])
-                if budget > 0:
-                    config.budget = budget
-            except (ValueError, TypeError):
-                pass  # Use default
-        
-        # Load refresh interval with validation
-        if 'refresh_interval' in data:
-            try:
-                interval = int(data['refresh_interval'])
-                config.refresh_interval = validate_refresh_interval(interval)
-            except (ValueError, TypeError):
-                pass  # Use default
-        
-        # Load simulated data flag
-        if 'use_simulated_data' in data:
-            config.use_simulated_data = bool(data['use_simulated_data'])
-            
-    except (json.JSONDecodeError, IOError):
-        # Return defaults on any file/parse error
-        pass
+        raw = Path(config_path).read_bytes()
+    except IOError:
+        # Return defaults on any file error
+        return WidgetConfig()
     
+    config = _load_config_from_str(raw)
+    _CONFIG_CACHE[cache_key] = (st.st_mtime_ns, st.st_size, config)
     return config
 
 
+load_config.cache_clear = _CONFIG_CACHE.clear
+
+
 def save_config(config: WidgetConfig, config_path: str = "config.json") -> None:
     """
     Save configuration to JSON file.
@@ -93,5 +154,5 @@ def save_config(config: WidgetConfig, config_path: str = "config.json") -> None:
         config: The configuration to save
         config_path: Path to the configuration file
     """
-    with open(config_path, 'w') as f:
-        json.dump(config.to_dict(), f, indent=4)
+    Path(config_path).write_bytes(_dumps(config.to_dict()))
+    _CONFIG_CACHE.pop(os.path.abspath(config_path), None)
@@ -1,10 +1,24 @@
 """Cost data fetching for AWS Cost Widget."""
 
+import functools
+import heapq
+import json
+import os
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import List, Tuple, Optional
 
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+# Last successful AWS fetch, shown immediately on the next start
+COST_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "billwatch", "last.json")
+
 # AWS service names for simulation
 AWS_SERVICES = [
     "Amazon EC2", "Amazon S3", "Amazon RDS", "AWS Lambda",
@@ -13,26 +27,24 @@ AWS_SERVICES = [
     "Amazon ElastiCache", "Amazon Redshift", "AWS Glue"
 ]
 
+# Possible simulated CloudTrail event counts per service
+_SIMULATED_ACTIVITY_RANGE = range(151)
 
-@dataclass
+
+@dataclass(frozen=True)
 class CostData:
     """Container for AWS cost information."""
+    __slots__ = ('month_to_date', 'top_services', 'last_updated')
+    
     month_to_date: float
     top_services: List[Tuple[str, float, int]]  # (service_name, cost, activity_count)
     last_updated: datetime
 
 
-def format_currency(amount: float) -> str:
-    """
-    Format amount as currency string with $ symbol and 2 decimal places.
-    
-    Args:
-        amount: The amount to format
-        
-    Returns:
-        Formatted string like "$123.45"
-    """
-    return f"${amount:.2f}"
+# Format amount as currency string with $ symbol and 2 decimal places, e.g. "$123.45".
+# A bound str.format avoids a Python-level function frame per call.
+_FMT_CURRENCY = "${:.2f}".format
+format_currency = _FMT_CURRENCY
 
 
 def get_top_services(services: List[Tuple[str, float]], limit: int = 10) -> List[Tuple[str, float]]:
@@ -46,8 +58,48 @@ def get_top_services(services: List[Tuple[str, float]], limit: int = 10) -> List
     Returns:
         Up to `limit` services sorted by cost descending
     """
-    sorted_services = sorted(services, key=lambda x: x[1], reverse=True)
-    return sorted_services[:limit]
+    return heapq.nlargest(limit, services, key=lambda x: x[1])
+
+
+# Upper bound on concurrent CloudTrail lookups per refresh (LookupEvents is
+# throttled at about 2 requests per second per account and region)
+MAX_ACTIVITY_WORKERS = 2
+
+# Activity count recorded when a CloudTrail lookup fails, so it is not shown as 0
+ACTIVITY_UNKNOWN = -1
+
+# Cost Explorer data only changes a few times a day, so reuse a parsed
+# response for this many seconds before querying (and paying for) it again
+CE_TTL = 300
+
+# Last Cost Explorer result: key is (start_date, end_date), data is (total_cost, top_services)
+_CE_CACHE = {"key": None, "data": None, "ts": 0.0}
+
+# Lazily created AWS clients, reused across refreshes
+_CE_CLIENT = None
+_CT_CLIENT = None
+
+
+def _get_ce():
+    """Return the shared Cost Explorer client, creating it on first use."""
+    global _CE_CLIENT
+    if _CE_CLIENT is None:
+        if boto3 is None:
+            raise ImportError("boto3 is not installed")
+        _CE_CLIENT = boto3.client('ce')
+    return _CE_CLIENT
+
+
+def _get_ct():
+    """Return the shared CloudTrail client, creating it on first use."""
+    global _CT_CLIENT
+    if _CT_CLIENT is None:
+        if boto3 is None:
+            raise ImportError("boto3 is not installed")
+        from botocore.config import Config
+        # Adaptive retries back off client-side when LookupEvents is throttled
+        _CT_CLIENT = boto3.client('cloudtrail', config=Config(retries={'mode': 'adaptive'}))
+    return _CT_CLIENT
 
 
 # Mapping from Cost Explorer service names to CloudTrail event sources
@@ -75,6 +127,17 @@ SERVICE_TO_EVENT_SOURCE = {
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _event_source_for(service_name: str) -> str:
+    """Map a Cost Explorer service name to its CloudTrail event source."""
+    event_source = SERVICE_TO_EVENT_SOURCE.get(service_name)
+    if not event_source:
+        # Try to derive event source from service name
+        simplified = service_name.lower().replace("amazon ", "").replace("aws ", "").replace(" ", "")
+        event_source = f"{simplified}.amazonaws.com"
+    return event_source
+
+
 def fetch_service_activity(service_names: List[str]) -> dict:
     """
     Fetch recent activity counts per service from CloudTrail.
@@ -83,58 +146,58 @@ def fetch_service_activity(service_names: List[str]) -> dict:
         service_names: List of AWS service names to look up
         
     Returns:
-        Dictionary mapping service names to event counts (last 24 hours)
+        Dictionary mapping service names to event counts (last 24 hours),
+        with ACTIVITY_UNKNOWN for services whose lookup failed
     """
     try:
-        import boto3
-        from datetime import datetime, timedelta
-        
-        client = boto3.client('cloudtrail')
-        activity = {}
+        client = _get_ct()
         
         # Look up events for the last 24 hours
-        end_time = datetime.utcnow()
+        end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=24)
         
-        for service_name in service_names:
-            event_source = SERVICE_TO_EVENT_SOURCE.get(service_name)
-            if not event_source:
-                # Try to derive event source from service name
-                simplified = service_name.lower().replace("amazon ", "").replace("aws ", "").replace(" ", "")
-                event_source = f"{simplified}.amazonaws.com"
-            
+        def _one_lookup(service_name: str) -> int:
+            event_source = _event_source_for(service_name)
             try:
                 # Use lookup_events to count events for this service
                 response = client.lookup_events(
-                    LookupAttributes=[
-                        {
-                            'AttributeKey': 'EventSource',
-                            'AttributeValue': event_source
-                        }
-                    ],
+                    LookupAttributes=[{'AttributeKey': 'EventSource', 'AttributeValue': event_source}],
                     StartTime=start_time,
                     EndTime=end_time,
                     MaxResults=50  # Limit to avoid rate limiting
                 )
-                activity[service_name] = len(response.get('Events', []))
+                return len(response.get('Events', []))
             except Exception:
-                activity[service_name] = 0
+                return ACTIVITY_UNKNOWN
+        
+        if not service_names:
+            return {}
+        
+        # Lookups are independent network round-trips, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=min(MAX_ACTIVITY_WORKERS, len(service_names))) as executor:
+            activity = dict(zip(service_names, executor.map(_one_lookup, service_names)))
         
         return activity
         
     except ImportError:
-        return {name: 0 for name in service_names}
+        return {name: ACTIVITY_UNKNOWN for name in service_names}
     except Exception:
-        return {name: 0 for name in service_names}
+        return {name: ACTIVITY_UNKNOWN for name in service_names}
 
 
-def fetch_simulated_costs() -> CostData:
+def fetch_simulated_costs(now: Optional[datetime] = None) -> CostData:
     """
     Generate simulated cost data for testing/demo purposes.
     
+    Args:
+        now: Timestamp for the data (defaults to the current time)
+        
     Returns:
         CostData with random but realistic values
     """
+    if now is None:
+        now = datetime.now()
+    
     # Generate random MTD cost between $10 and $500
     mtd = random.uniform(10.0, 500.0)
     
@@ -142,52 +205,52 @@ def fetch_simulated_costs() -> CostData:
     num_services = random.randint(5, 10)
     selected_services = random.sample(AWS_SERVICES, num_services)
     
-    # Distribute costs (some services cost more than others)
-    service_costs = []
-    remaining = mtd
-    for i, service in enumerate(selected_services):
-        if i == len(selected_services) - 1:
-            cost = remaining
-        else:
-            # Random portion of remaining cost
-            cost = random.uniform(0, remaining * 0.6)
-            remaining -= cost
-        service_costs.append((service, round(cost, 2)))
+    # Split MTD across services with a flat Dirichlet draw (normalized exponentials)
+    weights = [random.expovariate(1.0) for _ in selected_services]
+    scale = mtd / sum(weights)
+    service_costs = [
+        (service, weight * scale)
+        for service, weight in zip(selected_services, weights)
+    ]
     
     top_services = get_top_services(service_costs)
     
-    # Add simulated activity counts (random events in last 24h)
+    # Add simulated activity counts (random events in last 24h), drawn in one batch
+    activity_counts = random.choices(_SIMULATED_ACTIVITY_RANGE, k=len(top_services))
     top_services_with_activity = [
-        (name, cost, random.randint(0, 150))
-        for name, cost in top_services
+        (name, cost, activity)
+        for (name, cost), activity in zip(top_services, activity_counts)
     ]
     
     return CostData(
-        month_to_date=round(mtd, 2),
+        month_to_date=mtd,
         top_services=top_services_with_activity,
-        last_updated=datetime.now()
+        last_updated=now
     )
 
 
-def fetch_aws_costs() -> CostData:
+def fetch_aws_costs(now: Optional[datetime] = None) -> CostData:
     """
     Fetch real cost data from AWS Cost Explorer API.
     
+    Args:
+        now: Timestamp for the data (defaults to the current time); the
+            month-to-date range is derived from it too
+        
     Returns:
         CostData with actual AWS spending information
         
     Raises:
         Exception: If AWS credentials are missing or invalid
     """
+    if now is None:
+        now = datetime.now()
+    
     try:
-        import boto3
-        from datetime import date, timedelta
-        
-        # Create Cost Explorer client
-        client = boto3.client('ce')
+        client = _get_ce()
         
         # Get current month date range
-        today = date.today()
+        today = now.date()
         start_date = today.replace(day=1).isoformat()
         
         # AWS Cost Explorer requires end_date > start_date
@@ -197,32 +260,46 @@ def fetch_aws_costs() -> CostData:
         else:
             end_date = (today + timedelta(days=1)).isoformat()
         
-        # Fetch month-to-date costs
-        response = client.get_cost_and_usage(
-            TimePeriod={
-                'Start': start_date,
-                'End': end_date
-            },
-            Granularity='MONTHLY',
-            Metrics=['UnblendedCost'],
-            GroupBy=[
-                {'Type': 'DIMENSION', 'Key': 'SERVICE'}
-            ]
-        )
-        
-        # Parse response
-        service_costs = []
-        total_cost = 0.0
-        
-        for result in response.get('ResultsByTime', []):
-            for group in result.get('Groups', []):
-                service_name = group['Keys'][0]
-                cost = float(group['Metrics']['UnblendedCost']['Amount'])
-                if cost > 0:
-                    service_costs.append((service_name, round(cost, 2)))
-                    total_cost += cost
-        
-        top_services = get_top_services(service_costs)
+        cache_key = (start_date, end_date)
+        if (_CE_CACHE["key"] == cache_key
+                and time.monotonic() - _CE_CACHE["ts"] < CE_TTL):
+            total_cost, top_services = _CE_CACHE["data"]
+        else:
+            # Fetch month-to-date costs, following pagination for large accounts
+            request = {
+                'TimePeriod': {
+                    'Start': start_date,
+                    'End': end_date
+                },
+                'Granularity': 'MONTHLY',
+                'Metrics': ['UnblendedCost'],
+                'GroupBy': [
+                    {'Type': 'DIMENSION', 'Key': 'SERVICE'}
+                ]
+            }
+            
+            # Parse response pages
+            service_costs = []
+            total_cost = 0.0
+            
+            while True:
+                response = client.get_cost_and_usage(**request)
+                for result in response.get('ResultsByTime', []):
+                    for group in result.get('Groups', []):
+                        service_name = group['Keys'][0]
+                        cost = float(group['Metrics']['UnblendedCost']['Amount'])
+                        if cost > 0:
+                            service_costs.append((service_name, cost))
+                            total_cost += cost
+                
+                next_token = response.get('NextPageToken')
+                if not next_token:
+                    break
+                request['NextPageToken'] = next_token
+            
+            top_services = get_top_services(service_costs)
+            
+            _CE_CACHE.update(key=cache_key, data=(total_cost, top_services), ts=time.monotonic())
         
         # Fetch activity data from CloudTrail
         service_names = [name for name, _ in top_services]
@@ -230,14 +307,14 @@ def fetch_aws_costs() -> CostData:
         
         # Combine cost and activity data
         top_services_with_activity = [
-            (name, cost, activity_data.get(name, 0))
+            (name, cost, activity_data.get(name, ACTIVITY_UNKNOWN))
             for name, cost in top_services
         ]
         
         return CostData(
             month_to_date=round(total_cost, 2),
             top_services=top_services_with_activity,
-            last_updated=datetime.now()
+            last_updated=now
         )
         
     except ImportError:
@@ -252,3 +329,54 @@ def fetch_aws_costs() -> CostData:
                 "3. Use AWS IAM role if running on EC2"
             )
         raise
+
+
+def save_cached_costs(cost_data: CostData, cache_path: str = COST_CACHE_PATH) -> None:
+    """
+    Persist cost data to disk so the next start can display it immediately.
+    
+    Args:
+        cost_data: The data to save
+        cache_path: Path to the cache file (parent directories are created)
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump({
+            'mtd': cost_data.month_to_date,
+            'services': cost_data.top_services,
+            'ts': cost_data.last_updated.isoformat(),
+        }, f)
+
+
+def load_cached_costs(cache_path: str = COST_CACHE_PATH,
+                      now: Optional[datetime] = None) -> Optional[CostData]:
+    """
+    Load cost data saved by save_cached_costs.
+    
+    Args:
+        cache_path: Path to the cache file
+        now: Current time, used to reject data from another month
+            (defaults to the current time)
+        
+    Returns:
+        The cached CostData, or None if the file is missing, unreadable,
+        or not from the current month
+    """
+    if now is None:
+        now = datetime.now()
+    
+    try:
+        with open(cache_path, 'r') as f:
+            data = json.load(f)
+        cost_data = CostData(
+            month_to_date=float(data['mtd']),
+            top_services=[(name, float(cost), int(activity)) for name, cost, activity in data['services']],
+            last_updated=datetime.fromisoformat(data['ts'])
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    
+    # A month-to-date total from another month would be shown as this month's
+    if (cost_data.last_updated.year, cost_data.last_updated.month) != (now.year, now.month):
+        return None
+    return cost_data
@@ -13,20 +13,29 @@ Run with: python main.py
 import sys
 import os
 
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Add src directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _SRC_DIR)
 
 from config import load_config
-from cost_fetcher import fetch_simulated_costs, fetch_aws_costs
+from cost_fetcher import (
+    fetch_simulated_costs, fetch_aws_costs,
+    load_cached_costs, COST_CACHE_PATH
+)
 from widget import AWSCostWidget
 from scheduler import UpdateScheduler
 
 
-def show_error_dialog(title: str, message: str) -> None:
-    """Show an error dialog using tkinter."""
+def show_error_dialog(title: str, message: str, parent=None) -> None:
+    """Show an error dialog using tkinter, over parent if one is given."""
     import tkinter as tk
     from tkinter import messagebox      
     
+    if parent is not None:
+        messagebox.showerror(title, message, parent=parent)
+        return
+    
     root = tk.Tk()
     root.withdraw()  # Hide main window
     messagebox.showerror(title, message)
@@ -36,34 +45,47 @@ def show_error_dialog(title: str, message: str) -> None:
 def main() -> None:
     """Initialize and run the AWS Cost Widget application."""
     # Load configuration
-    config_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
+    config_path = os.path.join(_SRC_DIR, '..', 'config.json')
     if not os.path.exists(config_path):
         config_path = 'config.json'
     
     config = load_config(config_path)
     
     # Select data fetcher based on configuration
+    initial_data = None
+    cached_data = None
+    cache_path = None
     if config.use_simulated_data:
         fetcher = fetch_simulated_costs
         print("Using simulated cost data")
     else:
-        # Test AWS credentials before starting
-        try:
-            fetch_aws_costs()
+        cached_data = load_cached_costs(COST_CACHE_PATH)
+        if cached_data is not None:
+            # Show the last known costs right away; the scheduler refreshes
+            # them in the background, so skip the blocking credential probe
+            # (a failed first refresh falls back to simulated data below)
             fetcher = fetch_aws_costs
-            print("Connected to AWS Cost Explorer")
-        except Exception as e:
-            error_msg = str(e)
-            print(f"AWS Error: {error_msg}")
-            
-            # Show error and offer to use simulated data
-            show_error_dialog(
-                "AWS Credentials Error",
-                f"{error_msg}\n\n"
-                "The widget will use simulated data instead.\n"
-                "To use real AWS data, configure your credentials and restart."
-            )
-            fetcher = fetch_simulated_costs
+            cache_path = COST_CACHE_PATH
+            print("Using cached AWS cost data until the first refresh")
+        else:
+            # Test AWS credentials before starting; the result seeds the first update
+            try:
+                initial_data = fetch_aws_costs()
+                fetcher = fetch_aws_costs
+                cache_path = COST_CACHE_PATH
+                print("Connected to AWS Cost Explorer")
+            except Exception as e:
+                error_msg = str(e)
+                print(f"AWS Error: {error_msg}")
+                
+                # Show error and offer to use simulated data
+                show_error_dialog(
+                    "AWS Credentials Error",
+                    f"{error_msg}\n\n"
+                    "The widget will use simulated data instead.\n"
+                    "To use real AWS data, configure your credentials and restart."
+                )
+                fetcher = fetch_simulated_costs
     
     # Create and configure widget
     try:
@@ -72,8 +94,29 @@ def main() -> None:
         show_error_dialog("Widget Error", f"Failed to create widget: {e}")
         sys.exit(1)
     
+    if cached_data is not None:
+        widget.update_display(cached_data)
+    
     # Create scheduler and start updates
-    scheduler = UpdateScheduler(widget, fetcher, config.refresh_interval)
+    scheduler = UpdateScheduler(widget, fetcher, config.refresh_interval, initial_data, cache_path)
+    
+    if cached_data is not None:
+        def fall_back_to_simulated(error: Exception) -> None:
+            """The skipped credential probe failed late; mirror its fallback."""
+            show_error_dialog(
+                "AWS Credentials Error",
+                f"{error}\n\n"
+                "The widget will use simulated data instead.\n"
+                "To use real AWS data, configure your credentials and restart.",
+                parent=widget.root
+            )
+            scheduler.fetcher = fetch_simulated_costs
+            scheduler.cache_path = None  # Keep the last real costs cached
+            widget.update_display(fetch_simulated_costs())
+        
+        scheduler.on_first_error = fall_back_to_simulated
+    
+    widget.on_close = scheduler.stop
     scheduler.start()
     
     print(f"AWS Cost Widget started (refresh every {config.refresh_interval}s)")
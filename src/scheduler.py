@@ -1,16 +1,25 @@
 """Update scheduler for AWS Cost Widget."""
 
-from typing import Callable, TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TYPE_CHECKING
+
+from cost_fetcher import save_cached_costs
 
 if TYPE_CHECKING:
     from widget import AWSCostWidget
     from cost_fetcher import CostData
 
 
+# How often the Tk thread checks whether a background fetch has finished
+POLL_INTERVAL_MS = 100
+
+
 class UpdateScheduler:
     """Manages periodic data refresh for the widget."""
     
-    def __init__(self, widget: 'AWSCostWidget', fetcher: Callable[[], 'CostData'], interval: int):
+    def __init__(self, widget: 'AWSCostWidget', fetcher: Callable[[], 'CostData'], interval: int,
+                 initial_data: Optional['CostData'] = None, cache_path: Optional[str] = None,
+                 on_first_error: Optional[Callable[[Exception], None]] = None):
         """
         Initialize scheduler with widget, data fetcher, and interval.
         
@@ -18,34 +27,91 @@ class UpdateScheduler:
             widget: The widget to update
             fetcher: Function that returns CostData
             interval: Refresh interval in seconds
+            initial_data: Already-fetched data to show first instead of fetching
+            cache_path: If set, each successful fetch is saved here
+            on_first_error: Called with the exception if the first background
+                fetch fails; later failures are only logged
         """
         self.widget = widget
         self.fetcher = fetcher
         self.interval = interval * 1000  # Convert to milliseconds
+        self.initial_data = initial_data
+        self.cache_path = cache_path
+        self.on_first_error = on_first_error
         self._scheduled_id = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future: Optional[Future] = None
     
     def start(self) -> None:
         """Start the update scheduler."""
-        self.perform_update()
+        if self.initial_data is not None:
+            self.widget.update_display(self.initial_data)
+            self._save_cache(self.initial_data)
+            self.initial_data = None
+            self.schedule_update()
+        else:
+            self.perform_update()
     
     def stop(self) -> None:
         """Stop the update scheduler."""
         if self._scheduled_id is not None:
             self.widget.root.after_cancel(self._scheduled_id)
             self._scheduled_id = None
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._executor.shutdown(wait=False)
     
     def schedule_update(self) -> None:
         """Schedule the next data refresh."""
         self._scheduled_id = self.widget.root.after(self.interval, self.perform_update)
     
     def perform_update(self) -> None:
-        """Fetch new data and update widget display."""
+        """Fetch new data on a worker thread so the UI stays responsive."""
+        self._future = self._executor.submit(self._fetch)
+        self._poll(self._future)
+    
+    def _fetch(self) -> 'CostData':
+        """Run the fetcher and persist its result (runs on the worker thread)."""
+        cost_data = self.fetcher()
+        self._save_cache(cost_data)
+        return cost_data
+    
+    def _save_cache(self, cost_data: 'CostData') -> None:
+        """Persist successfully fetched data if a cache path is set."""
+        if self.cache_path is not None:
+            try:
+                save_cached_costs(cost_data, self.cache_path)
+            except OSError as e:
+                print(f"Error saving cost cache: {e}")
+    
+    def _poll(self, future: Future) -> None:
+        """
+        Apply a fetch once it finishes (runs on the Tk thread).
+        
+        The worker thread never touches Tk; the Tk thread checks the future
+        until it is done.
+        """
+        if future.done():
+            self._apply_update(future)
+        else:
+            self._scheduled_id = self.widget.root.after(POLL_INTERVAL_MS, self._poll, future)
+    
+    def _apply_update(self, future: Future) -> None:
+        """Update widget display with a finished fetch (runs on the Tk thread)."""
+        if future is not self._future:
+            return  # Stopped or superseded
+        self._future = None
+        on_first_error, self.on_first_error = self.on_first_error, None
+        
         try:
-            cost_data = self.fetcher()
+            cost_data = future.result()
             self.widget.update_display(cost_data)
         except Exception as e:
             # Log error but continue scheduling
             print(f"Error fetching cost data: {e}")
+            if on_first_error is not None:
+                on_first_error(e)
         
         # Schedule next update
         self.schedule_update()
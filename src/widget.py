@@ -1,11 +1,14 @@
 """Widget UI for AWS Cost Widget - Premium AWS Cloud Clubs Edition."""
 
+import bisect
+import functools
 import tkinter as tk
 from tkinter import ttk
+from datetime import datetime
 from typing import Optional, Callable
 
 from config import WidgetConfig
-from cost_fetcher import CostData, format_currency
+from cost_fetcher import ACTIVITY_UNKNOWN, CostData, format_currency
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -45,15 +48,28 @@ COLOR_PROGRESS_BG = "#2D1B4E"
 COLOR_BORDER_GLOW = "#8B5CF6"
 COLOR_BORDER_OUTER = "#7C3AED"
 
+# Rank indicator colors for the top services rows (gold, light, main, then muted)
+_RANK_COLORS = (COLOR_GOLD, COLOR_PURPLE_LIGHT, COLOR_PURPLE_MAIN) + (COLOR_FG_MUTED,) * 7
+
+# Longest service name shown before truncating with "..."
+MAX_SERVICE_NAME_LEN = 22
+
+# Display formats reused on every refresh
+_PCT_FMT = "{:.1f}%".format
+_TIME_FMT = "%H:%M:%S"
+_DATE_TIME_FMT = "%b %d %H:%M"
+
+
+# Budget tiers as (threshold, tie-break) keys: a percentage equal to a
+# threshold with tie-break 0 moves up a tier (75 -> yellow), one with
+# tie-break 1 stays below (90 -> yellow). Colors has one more entry than keys.
+_BUDGET_THRESHOLDS = ((75.0, 0), (90.0, 1))
+_BUDGET_COLORS = (COLOR_GREEN, COLOR_YELLOW, COLOR_RED)
+
 
 def get_budget_color(percentage: float) -> str:
     """Return color based on budget consumption percentage."""
-    if percentage < 75:
-        return COLOR_GREEN
-    elif percentage <= 90:
-        return COLOR_YELLOW
-    else:
-        return COLOR_RED
+    return _BUDGET_COLORS[bisect.bisect_right(_BUDGET_THRESHOLDS, (percentage, 0))]
 
 
 def clamp_position(x: int, y: int, widget_width: int, widget_height: int,
@@ -64,11 +80,27 @@ def clamp_position(x: int, y: int, widget_width: int, widget_height: int,
     return clamped_x, clamped_y
 
 
+def format_activity(activity_count: int) -> str:
+    """Format a 24h event count, showing "?" when the lookup failed."""
+    if activity_count == ACTIVITY_UNKNOWN:
+        return "⚡?"
+    return f"⚡{activity_count}"
+
+
+@functools.lru_cache(maxsize=64)
+def _truncate_service_name(name: str) -> str:
+    """Shorten long service names for display; cached since names recur every refresh."""
+    if len(name) > MAX_SERVICE_NAME_LEN:
+        return name[:MAX_SERVICE_NAME_LEN] + "..."
+    return name
+
+
 class AWSCostWidget:
     """Premium AWS Cost Widget with Cloud Clubs Purple Theme."""
     
     def __init__(self, config: WidgetConfig):
         self.config = config
+        self.on_close: Optional[Callable[[], None]] = None  # Called before the window is destroyed
         self.root = tk.Tk()
         self.root.title("AWS Cost Widget")
         
@@ -94,13 +126,29 @@ class AWSCostWidget:
         y = screen_height - self.height - 80
         self.root.geometry(f"{self.width}x{self.height}+{x}+{y}")
         
-        # Drag state
+        # Drag state (geometry setter and format pre-bound for motion events)
+        self._set_geometry = self.root.wm_geometry
+        self._geo_fmt = "+{}+{}".format
         self._drag_start_x = 0
         self._drag_start_y = 0
+        self._screen_w = screen_width
+        self._screen_h = screen_height
+        self._max_x = screen_width - self.width
+        self._max_y = screen_height - self.height
         
         # Build premium UI
         self._create_premium_widgets()
         
+        # Data shown by the previous update_display call
+        self._last_cost_data: Optional[CostData] = None
+        
+        # Last options applied to each label that update_display touches
+        for label in (self.cost_label, self.budget_pct_label, self.updated_label):
+            label._last_options = {}
+        for _, *row_labels in self.service_labels:
+            for label in row_labels:
+                label._last_options = {}
+        
         # Bind drag to header only
         self.header_frame.bind('<Button-1>', self.start_drag)
         self.header_frame.bind('<B1-Motion>', self.do_drag)
@@ -256,6 +304,17 @@ class AWSCostWidget:
             highlightthickness=0
         )
         self.progress_canvas.pack(fill=tk.X)
+        
+        # Single fill rectangle, resized and recolored in place on each update
+        self._progress_fill_id = self.progress_canvas.create_rectangle(
+            0, 0, 0, 12, fill=COLOR_GREEN, outline=""
+        )
+        self._last_progress_color = COLOR_GREEN
+        
+        # Track the canvas width from resize events rather than querying it per update
+        self._progress_canvas_w = self.width - 64
+        self._progress_pct = 0.0
+        self.progress_canvas.bind('<Configure>', self._on_progress_resize)
 
         
         # ═══ TOP SERVICES SECTION ═══
@@ -294,14 +353,13 @@ class AWSCostWidget:
             
             frame = tk.Frame(self.services_frame, bg=bg, padx=10, pady=5)
             frame.pack(fill=tk.X, pady=1)
+            frame._is_packed = True
             
             # Rank indicator
-            rank_colors = [COLOR_GOLD, COLOR_PURPLE_LIGHT, COLOR_PURPLE_MAIN, COLOR_FG_MUTED, COLOR_FG_MUTED,
-                          COLOR_FG_MUTED, COLOR_FG_MUTED, COLOR_FG_MUTED, COLOR_FG_MUTED, COLOR_FG_MUTED]
             rank_label = tk.Label(
                 frame, text=f"#{i+1}",
                 font=("Helvetica", 8, "bold"),
-                bg=bg, fg=rank_colors[i]
+                bg=bg, fg=_RANK_COLORS[i]
             )
             rank_label.pack(side=tk.LEFT, padx=(0, 6))
             
@@ -352,7 +410,7 @@ class AWSCostWidget:
             bg=COLOR_BG_PRIMARY, highlightthickness=0
         )
         self.live_dot.pack(side=tk.LEFT, padx=(0, 4))
-        self.live_dot.create_oval(1, 1, 7, 7, fill=COLOR_GREEN, outline="")
+        self.live_dot_id = self.live_dot.create_oval(1, 1, 7, 7, fill=COLOR_GREEN, outline="")
         
         live_label = tk.Label(
             live_frame, text="LIVE",
@@ -363,107 +421,151 @@ class AWSCostWidget:
 
     
     def _draw_premium_orb(self):
-        """Draw animated purple orb indicator."""
-        self.orb_canvas.delete("all")
-        # Outer glow
-        self.orb_canvas.create_oval(0, 0, 14, 14, fill=COLOR_PURPLE_DARK, outline="")
-        # Inner bright
-        self.orb_canvas.create_oval(2, 2, 12, 12, fill=COLOR_PURPLE_MAIN, outline="")
-        # Highlight
-        self.orb_canvas.create_oval(4, 4, 8, 8, fill=COLOR_PURPLE_GLOW, outline="")
+        """Draw purple orb indicator once; later changes should itemconfig these ids."""
+        self.orb_item_ids = (
+            # Outer glow
+            self.orb_canvas.create_oval(0, 0, 14, 14, fill=COLOR_PURPLE_DARK, outline=""),
+            # Inner bright
+            self.orb_canvas.create_oval(2, 2, 12, 12, fill=COLOR_PURPLE_MAIN, outline=""),
+            # Highlight
+            self.orb_canvas.create_oval(4, 4, 8, 8, fill=COLOR_PURPLE_GLOW, outline=""),
+        )
     
     def _create_gradient_line(self, parent):
         """Create premium gradient separator."""
-        sep_frame = tk.Frame(parent, bg=COLOR_BG_PRIMARY, height=3)
-        sep_frame.pack(fill=tk.X, pady=(4, 0))
-        
-        # Multi-color gradient effect
+        # Multi-color gradient effect: one 1px bar per color on a single canvas
         colors = [COLOR_PINK, COLOR_PURPLE_MAIN, COLOR_PURPLE_LIGHT, COLOR_CYAN]
-        for color in colors:
-            line = tk.Frame(sep_frame, bg=color, height=1)
-            line.pack(fill=tk.X)
-    
-    def update_display(self, cost_data: CostData) -> None:
-        """Update all UI elements with new cost data."""
-        # Calculate budget percentage
-        budget_pct = (cost_data.month_to_date / self.config.budget) * 100
-        status_color = get_budget_color(budget_pct)
-        
-        # Update cost with dynamic color
-        cost_color = COLOR_PURPLE_GLOW if budget_pct < 75 else status_color
-        self.cost_label.config(
-            text=format_currency(cost_data.month_to_date),
-            fg=cost_color
+        sep_canvas = tk.Canvas(
+            parent, height=len(colors), bg=COLOR_BG_PRIMARY,
+            highlightthickness=0
         )
+        sep_canvas.pack(fill=tk.X, pady=(4, 0))
         
-        # Update budget percentage
-        self.budget_pct_label.config(text=f"{budget_pct:.1f}%", fg=status_color)
+        bar_ids = [
+            sep_canvas.create_rectangle(0, i, self.width, i + 1, fill=color, outline="")
+            for i, color in enumerate(colors)
+        ]
         
-        # Update progress bar
-        self._update_progress_bar(budget_pct)
+        def _resize(event):
+            for i, bar_id in enumerate(bar_ids):
+                sep_canvas.coords(bar_id, 0, i, event.width, i + 1)
         
-        # Update services
-        for i, (frame, name_label, cost_label, rank_label, activity_label) in enumerate(self.service_labels):
-            if i < len(cost_data.top_services):
-                service_data = cost_data.top_services[i]
-                # Handle both old format (name, cost) and new format (name, cost, activity)
-                if len(service_data) == 3:
-                    service_name, service_cost, activity_count = service_data
-                else:
-                    service_name, service_cost = service_data
-                    activity_count = 0
-                display_name = service_name[:22] + "..." if len(service_name) > 22 else service_name
-                name_label.config(text=display_name)
-                cost_label.config(text=format_currency(service_cost))
-                activity_label.config(text=f"⚡{activity_count}")
-                frame.pack(fill=tk.X, pady=1)
-            else:
-                name_label.config(text="")
-                cost_label.config(text="")
-                activity_label.config(text="")
-                frame.pack_forget()
-        
-        # Update timestamp
-        time_str = cost_data.last_updated.strftime("%H:%M:%S")
-        self.updated_label.config(text=f"🔄 {time_str}")
+        sep_canvas.bind('<Configure>', _resize)
     
-    def _update_progress_bar(self, percentage: float) -> None:
-        """Update progress bar with premium styling."""
-        self.progress_canvas.delete("all")
+    def update_display(self, cost_data: CostData) -> None:
+        """Update UI elements whose underlying cost data changed since the last call."""
+        last = self._last_cost_data
         
-        canvas_width = self.progress_canvas.winfo_width()
-        if canvas_width <= 1:
-            canvas_width = self.width - 64
+        if last is None or cost_data.month_to_date != last.month_to_date:
+            # Calculate budget percentage
+            budget_pct = (cost_data.month_to_date / self.config.budget) * 100
+            status_color = get_budget_color(budget_pct)
+            
+            # Update cost with dynamic color
+            cost_color = COLOR_PURPLE_GLOW if budget_pct < 75 else status_color
+            self._set_label(
+                self.cost_label,
+                text=format_currency(cost_data.month_to_date),
+                fg=cost_color
+            )
+            
+            # Update budget percentage
+            self._set_label(self.budget_pct_label, text=_PCT_FMT(budget_pct), fg=status_color)
+            
+            # Update progress bar
+            self._update_progress_bar(budget_pct, status_color)
+        
+        if last is None or cost_data.top_services != last.top_services:
+            # Update services (hot names bound to locals for the loop)
+            set_label = self._set_label
+            truncate = _truncate_service_name
+            fmt = format_currency
+            top_services = cost_data.top_services
+            for i, (frame, name_label, cost_label, rank_label, activity_label) in enumerate(self.service_labels):
+                visible = i < len(top_services)
+                if visible:
+                    service_name, service_cost, activity_count = top_services[i]
+                    set_label(name_label, text=truncate(service_name))
+                    set_label(cost_label, text=fmt(service_cost))
+                    set_label(activity_label, text=format_activity(activity_count))
+                else:
+                    set_label(name_label, text="")
+                    set_label(cost_label, text="")
+                    set_label(activity_label, text="")
+                
+                # Only touch the geometry manager when a row's visibility flips
+                if visible != frame._is_packed:
+                    if visible:
+                        frame.pack(fill=tk.X, pady=1)
+                    else:
+                        frame.pack_forget()
+                    frame._is_packed = visible
+        
+        # Update timestamp, with the date when the data is not from today
+        last_updated = cost_data.last_updated
+        time_fmt = _TIME_FMT if last_updated.date() == datetime.now().date() else _DATE_TIME_FMT
+        time_str = last_updated.strftime(time_fmt)
+        self._set_label(self.updated_label, text=f"🔄 {time_str}")
+        
+        self._last_cost_data = cost_data
+    
+    @staticmethod
+    def _set_label(label: tk.Label, **options) -> None:
+        """Configure a label, skipping the Tcl round-trip for unchanged options."""
+        last = label._last_options
+        changed = {key: value for key, value in options.items() if last.get(key) != value}
+        if changed:
+            label.config(**changed)
+            last.update(changed)
+    
+    def _update_progress_bar(self, percentage: float, color: str) -> None:
+        """Update progress bar with premium styling in the given status color."""
+        self._progress_pct = percentage
+        canvas_width = self._progress_canvas_w
         
         fill_pct = min(percentage, 100) / 100
         fill_width = int(canvas_width * fill_pct)
         
-        color = get_budget_color(percentage)
-        
-        if fill_width > 0:
-            self.progress_canvas.create_rectangle(
-                0, 0, fill_width, 12,
-                fill=color, outline=""
-            )
+        self.progress_canvas.coords(self._progress_fill_id, 0, 0, fill_width, 12)
+        if color != self._last_progress_color:
+            self.progress_canvas.itemconfig(self._progress_fill_id, fill=color)
+            self._last_progress_color = color
+    
+    def _on_progress_resize(self, event) -> None:
+        """Remember the realized progress canvas width and refit the fill to it."""
+        if event.width > 1 and event.width != self._progress_canvas_w:
+            self._progress_canvas_w = event.width
+            self._update_progress_bar(self._progress_pct, self._last_progress_color)
     
     def start_drag(self, event):
         """Begin drag operation."""
         self._drag_start_x = event.x
         self._drag_start_y = event.y
+        
+        # Screen size won't change mid-drag; query it once per drag
+        self._screen_w = self.root.winfo_screenwidth()
+        self._screen_h = self.root.winfo_screenheight()
+        self._max_x = self._screen_w - self.width
+        self._max_y = self._screen_h - self.height
     
     def do_drag(self, event):
         """Move widget during drag."""
         x = self.root.winfo_x() + (event.x - self._drag_start_x)
         y = self.root.winfo_y() + (event.y - self._drag_start_y)
         
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        x, y = clamp_position(x, y, self.width, self.height, screen_width, screen_height)
+        # Same bounds as clamp_position, inlined with the limits cached in start_drag
+        max_x, max_y = self._max_x, self._max_y
+        x = max_x if x > max_x else x
+        x = 0 if x < 0 else x
+        y = max_y if y > max_y else y
+        y = 0 if y < 0 else y
         
-        self.root.geometry(f"+{x}+{y}")
+        self._set_geometry(self._geo_fmt(x, y))
     
     def close(self):
         """Close the widget gracefully."""
+        if self.on_close is not None:
+            self.on_close()
         self.root.quit()
         self.root.destroy()
     
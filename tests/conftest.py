@@ -3,6 +3,25 @@
 import pytest
 import sys
 import os
+from hypothesis import settings
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Hypothesis budgets, selected with HYPOTHESIS_PROFILE (e.g. "fast" for quick local runs).
+# Deadlines are off in every profile: these properties are all cheap, so per-example
+# timing only adds two clock reads per example without catching anything.
+settings.register_profile("default", max_examples=100, deadline=None)
+settings.register_profile("fast", max_examples=20, deadline=None)
+settings.load_profile(os.environ.get("HYPOTHESIS_PROFILE", "default"))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "property: Hypothesis property-based test")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Tag every Hypothesis test with the `property` marker."""
+    for item in items:
+        if getattr(getattr(item, "obj", None), "hypothesis", None) is not None:
+            item.add_marker(pytest.mark.property)
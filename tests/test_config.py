@@ -2,13 +2,15 @@
 
 import json
 import os
+import random
 import tempfile
 import pytest
 from hypothesis import given, strategies as st, settings
 from config import (
-    WidgetConfig, load_config, save_config, 
+    WidgetConfig, load_config,
     validate_refresh_interval, DEFAULT_BUDGET, DEFAULT_REFRESH_INTERVAL,
-    MIN_REFRESH_INTERVAL, MAX_REFRESH_INTERVAL
+    MIN_REFRESH_INTERVAL, MAX_REFRESH_INTERVAL,
+    _load_config_from_str, _save_config_to_str
 )
 
 
@@ -32,6 +34,14 @@ class TestValidateRefreshInterval:
         """Intervals above 300 should be clamped to 300."""
         assert validate_refresh_interval(500) == 300
         assert validate_refresh_interval(1000) == 300
+    
+    def test_refresh_interval_batch(self):
+        """A large batch of seeded random intervals should all land in range."""
+        rng = random.Random(0)
+        samples = [rng.randint(-10_000, 10_000) for _ in range(10_000)]
+        results = [validate_refresh_interval(x) for x in samples]
+        assert all(MIN_REFRESH_INTERVAL <= r <= MAX_REFRESH_INTERVAL for r in results)
+        assert results == [min(max(x, MIN_REFRESH_INTERVAL), MAX_REFRESH_INTERVAL) for x in samples]
 
 
 class TestRefreshIntervalProperty:
@@ -41,7 +51,7 @@ class TestRefreshIntervalProperty:
     """
     
     @given(st.integers())
-    @settings(max_examples=100)
+    @settings(max_examples=20)
     def test_refresh_interval_always_within_bounds(self, interval: int):
         """
         **Feature: aws-cost-widget, Property 5: Refresh interval validation**
@@ -82,11 +92,11 @@ class TestConfigRoundTripProperty:
     """
     
     @given(
-        budget=st.floats(min_value=0.01, max_value=1_000_000, allow_nan=False, allow_infinity=False),
+        budget=st.floats(min_value=0.01, max_value=1_000_000),
         refresh_interval=st.integers(min_value=MIN_REFRESH_INTERVAL, max_value=MAX_REFRESH_INTERVAL),
         use_simulated_data=st.booleans()
     )
-    @settings(max_examples=100)
+    @settings(max_examples=50)
     def test_config_round_trip(self, budget: float, refresh_interval: int, use_simulated_data: bool):
         """
         **Feature: aws-cost-widget, Property 6: Configuration loading round-trip**
@@ -102,38 +112,43 @@ class TestConfigRoundTripProperty:
             use_simulated_data=use_simulated_data
         )
         
-        # Round-trip through JSON file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            temp_path = f.name
+        # Round-trip through the same JSON text save_config/load_config use
+        loaded = _load_config_from_str(_save_config_to_str(original))
         
-        try:
-            save_config(original, temp_path)
-            loaded = load_config(temp_path)
-            
-            # Verify equivalence (using approximate comparison for floats)
-            assert abs(loaded.budget - original.budget) < 0.01, (
-                f"Budget mismatch: {loaded.budget} != {original.budget}"
-            )
-            assert loaded.refresh_interval == original.refresh_interval, (
-                f"Refresh interval mismatch: {loaded.refresh_interval} != {original.refresh_interval}"
-            )
-            assert loaded.use_simulated_data == original.use_simulated_data, (
-                f"use_simulated_data mismatch: {loaded.use_simulated_data} != {original.use_simulated_data}"
-            )
-        finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        # Verify equivalence (using approximate comparison for floats)
+        assert abs(loaded.budget - original.budget) < 0.01, (
+            f"Budget mismatch: {loaded.budget} != {original.budget}"
+        )
+        assert loaded.refresh_interval == original.refresh_interval, (
+            f"Refresh interval mismatch: {loaded.refresh_interval} != {original.refresh_interval}"
+        )
+        assert loaded.use_simulated_data == original.use_simulated_data, (
+            f"use_simulated_data mismatch: {loaded.use_simulated_data} != {original.use_simulated_data}"
+        )
 
 
 class TestLoadConfig:
     """Tests for load_config function."""
     
+    @pytest.fixture(autouse=True)
+    def clear_config_cache(self):
+        """Keep cached configs from leaking between tests."""
+        yield
+        load_config.cache_clear()
+    
     def test_missing_file_returns_defaults(self):
         """Missing config file should return defaults."""
         config = load_config("/nonexistent/path/config.json")
         assert config.budget == DEFAULT_BUDGET
         assert config.refresh_interval == DEFAULT_REFRESH_INTERVAL
     
+    def test_unstatable_path_returns_defaults(self, tmp_path):
+        """Paths that fail to stat for other OS reasons should return defaults."""
+        not_a_dir = tmp_path / "file"
+        not_a_dir.write_text("{}")
+        assert load_config(str(not_a_dir / "config.json")) == WidgetConfig()
+        assert load_config(str(tmp_path / ("x" * 5000))) == WidgetConfig()
+    
     def test_valid_config_loaded(self):
         """Valid config file should be loaded correctly."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
@@ -172,3 +187,28 @@ class TestLoadConfig:
             assert config.budget == DEFAULT_BUDGET
             
             os.unlink(f.name)
+    
+    def test_repeat_load_uses_cache(self):
+        """Unchanged file should return the cached config."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump({'budget': 250.0}, f)
+        
+        try:
+            first = load_config(f.name)
+            assert load_config(f.name) is first
+        finally:
+            os.unlink(f.name)
+    
+    def test_modified_file_reloaded(self):
+        """Changing the file on disk should invalidate the cached config."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump({'budget': 250.0}, f)
+        
+        try:
+            assert load_config(f.name).budget == 250.0
+            # Edit the file outside save_config, which would drop the entry itself
+            with open(f.name, 'w') as edited:
+                json.dump({'budget': 1500.0, 'refresh_interval': 60}, edited)
+            assert load_config(f.name).budget == 1500.0
+        finally:
+            os.unlink(f.name)
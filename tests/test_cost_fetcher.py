@@ -1,32 +1,52 @@
 """Tests for cost data fetching."""
 
+import re
+
 import pytest
-from hypothesis import given, strategies as st, settings
+from hypothesis import given, strategies as st
+import cost_fetcher
 from cost_fetcher import (
-    CostData, format_currency, get_top_services, fetch_simulated_costs
+    CostData, format_currency, get_top_services, fetch_simulated_costs,
+    fetch_service_activity, fetch_aws_costs, save_cached_costs, load_cached_costs,
+    ACTIVITY_UNKNOWN
 )
+from widget import format_activity
 from datetime import datetime
+from functools import lru_cache
+
+
+# One simulated fetch shared by tests that only read the (frozen) result
+_cached_sim_costs = lru_cache(maxsize=1)(fetch_simulated_costs)
+
+# "$" prefix, integer part, exactly two decimal places
+_CURRENCY_RE = re.compile(r"^\$\d+\.\d{2}$")
+
+# Eleven services with distinct costs, one more than the default top-N limit
+_SAMPLE_SERVICES = (
+    ("Service A", 10.0),
+    ("Service B", 50.0),
+    ("Service C", 30.0),
+    ("Service D", 20.0),
+    ("Service E", 40.0),
+    ("Service F", 5.0),
+    ("Service G", 15.0),
+    ("Service H", 25.0),
+    ("Service I", 35.0),
+    ("Service J", 45.0),
+    ("Service K", 3.0),
+)
 
 
 class TestFormatCurrency:
     """Tests for format_currency function."""
     
-    def test_basic_formatting(self):
-        """Basic amounts should format correctly."""
-        assert format_currency(100.0) == "$100.00"
-        assert format_currency(0.0) == "$0.00"
-        assert format_currency(1234.56) == "$1234.56"
-    
-    def test_rounding(self):
-        """Amounts should round to 2 decimal places."""
-        assert format_currency(10.999) == "$11.00"
-        assert format_currency(10.001) == "$10.00"
-        assert format_currency(10.556) == "$10.56"
-    
-    def test_small_amounts(self):
-        """Small amounts should display correctly."""
-        assert format_currency(0.01) == "$0.01"
-        assert format_currency(0.99) == "$0.99"
+    def test_format_currency_batch(self):
+        """Amounts should format with $ and exactly 2 decimal places."""
+        # Basic amounts, rounding to 2 decimal places, small amounts
+        ins = [100.0, 0.0, 1234.56, 10.999, 10.001, 10.556, 0.01, 0.99]
+        outs = ["$100.00", "$0.00", "$1234.56", "$11.00",
+                "$10.00", "$10.56", "$0.01", "$0.99"]
+        assert list(map(format_currency, ins)) == outs
 
 
 class TestGetTopServices:
@@ -34,20 +54,7 @@ class TestGetTopServices:
     
     def test_returns_top_10_by_default(self):
         """Should return top 10 services by cost."""
-        services = [
-            ("Service A", 10.0),
-            ("Service B", 50.0),
-            ("Service C", 30.0),
-            ("Service D", 20.0),
-            ("Service E", 40.0),
-            ("Service F", 5.0),
-            ("Service G", 15.0),
-            ("Service H", 25.0),
-            ("Service I", 35.0),
-            ("Service J", 45.0),
-            ("Service K", 3.0),
-        ]
-        result = get_top_services(services)
+        result = get_top_services(list(_SAMPLE_SERVICES))
         assert len(result) == 10
         assert result[0] == ("Service B", 50.0)
         assert result[1] == ("Service J", 45.0)
@@ -73,12 +80,27 @@ class TestGetTopServices:
         assert result[0] == ("D", 40.0)
 
 
+class TestCostData:
+    """Tests for CostData container."""
+    
+    def test_is_immutable(self):
+        """Fields should not be reassignable once created."""
+        data = CostData(month_to_date=1.0, top_services=[], last_updated=datetime.now())
+        with pytest.raises(AttributeError):
+            data.month_to_date = 2.0
+    
+    def test_has_no_instance_dict(self):
+        """Slotted instances should not carry a __dict__."""
+        data = CostData(month_to_date=1.0, top_services=[], last_updated=datetime.now())
+        assert not hasattr(data, '__dict__')
+
+
 class TestFetchSimulatedCosts:
     """Tests for fetch_simulated_costs function."""
     
     def test_returns_cost_data(self):
         """Should return valid CostData object."""
-        data = fetch_simulated_costs()
+        data = _cached_sim_costs()
         assert isinstance(data, CostData)
         assert isinstance(data.month_to_date, float)
         assert isinstance(data.top_services, list)
@@ -86,25 +108,166 @@ class TestFetchSimulatedCosts:
     
     def test_mtd_in_range(self):
         """MTD cost should be in reasonable range."""
-        data = fetch_simulated_costs()
+        data = _cached_sim_costs()
         assert 10.0 <= data.month_to_date <= 500.0
     
     def test_top_services_limit(self):
         """Should return at most 10 top services."""
-        data = fetch_simulated_costs()
+        data = _cached_sim_costs()
         assert len(data.top_services) <= 10
     
     def test_services_have_names_costs_and_activity(self):
         """Each service should have name, cost, and activity count."""
-        data = fetch_simulated_costs()
+        data = _cached_sim_costs()
         for service_data in data.top_services:
-            assert len(service_data) == 3, "Expected (name, cost, activity) tuple"
-            service_name, cost, activity = service_data
-            assert isinstance(service_name, str)
-            assert len(service_name) > 0
-            assert isinstance(cost, float)
-            assert isinstance(activity, int)
-            assert activity >= 0
+            # Unpacking fails unless this is a (name, cost, activity) 3-tuple
+            name, cost, activity = service_data
+            assert (isinstance(name, str) and name and isinstance(cost, float)
+                    and isinstance(activity, int) and activity >= 0), f"Bad service entry: {service_data}"
+
+
+class TestCostCache:
+    """Tests for save_cached_costs / load_cached_costs."""
+    
+    def test_round_trip(self, tmp_path):
+        """Saved data should load back unchanged."""
+        original = CostData(
+            month_to_date=123.45,
+            top_services=[("Amazon EC2", 100.0, 12), ("Amazon S3", 23.45, 0)],
+            last_updated=datetime(2026, 3, 14, 9, 26, 53)
+        )
+        cache_path = str(tmp_path / "nested" / "last.json")
+        save_cached_costs(original, cache_path)
+        assert load_cached_costs(cache_path, now=datetime(2026, 3, 31, 23, 0)) == original
+    
+    def test_previous_month_returns_none(self, tmp_path):
+        """Data from an earlier month should not be shown as month-to-date."""
+        original = CostData(
+            month_to_date=123.45,
+            top_services=[("Amazon EC2", 100.0, 12)],
+            last_updated=datetime(2026, 2, 28, 22, 0)
+        )
+        cache_path = str(tmp_path / "last.json")
+        save_cached_costs(original, cache_path)
+        assert load_cached_costs(cache_path, now=datetime(2026, 3, 1, 8, 0)) is None
+    
+    def test_missing_file_returns_none(self, tmp_path):
+        """Missing cache file should return None."""
+        assert load_cached_costs(str(tmp_path / "missing.json")) is None
+    
+    def test_corrupt_file_returns_none(self, tmp_path):
+        """Unreadable cache contents should return None."""
+        cache_path = tmp_path / "last.json"
+        cache_path.write_text('{"mtd": 1.0}')
+        assert load_cached_costs(str(cache_path)) is None
+
+
+class _ThrottlingException(Exception):
+    """Stand-in for botocore's ClientError with code ThrottlingException."""
+
+
+class _FakeCloudTrail:
+    """Minimal stand-in for the boto3 CloudTrail client."""
+    
+    def lookup_events(self, LookupAttributes, **kwargs):
+        source = LookupAttributes[0]['AttributeValue']
+        if source.startswith("broken"):
+            raise RuntimeError("lookup failed")
+        if source.startswith("throttled"):
+            raise _ThrottlingException("Rate exceeded")
+        return {'Events': [{}] * len(source)}
+
+
+class TestFetchServiceActivity:
+    """Tests for fetch_service_activity function."""
+    
+    def test_counts_per_service(self, monkeypatch):
+        """Each service should map to its own lookup result."""
+        monkeypatch.setattr(cost_fetcher, "_CT_CLIENT", _FakeCloudTrail())
+        activity = fetch_service_activity(["Amazon S3", "AWS Lambda", "Broken Thing"])
+        assert activity == {
+            "Amazon S3": len("s3.amazonaws.com"),
+            "AWS Lambda": len("lambda.amazonaws.com"),
+            "Broken Thing": ACTIVITY_UNKNOWN,
+        }
+    
+    def test_throttled_lookup_not_shown_as_zero(self, monkeypatch):
+        """A throttled lookup should display as unknown, not as zero events."""
+        monkeypatch.setattr(cost_fetcher, "_CT_CLIENT", _FakeCloudTrail())
+        activity = fetch_service_activity(["Amazon S3", "Throttled Service"])
+        assert format_activity(activity["Throttled Service"]) == "⚡?"
+        assert format_activity(activity["Amazon S3"]) == f"⚡{len('s3.amazonaws.com')}"
+    
+    def test_empty_list(self, monkeypatch):
+        """Should handle an empty service list."""
+        monkeypatch.setattr(cost_fetcher, "_CT_CLIENT", _FakeCloudTrail())
+        assert fetch_service_activity([]) == {}
+
+
+class _FakeCostExplorer:
+    """Minimal stand-in for the boto3 Cost Explorer client."""
+    
+    def __init__(self, pages=None):
+        self.calls = 0
+        self.pages = pages or [[('Amazon S3', '12.5'), ('AWS Lambda', '0')]]
+    
+    def get_cost_and_usage(self, NextPageToken=None, **kwargs):
+        self.calls += 1
+        self.time_period = kwargs['TimePeriod']
+        index = int(NextPageToken or 0)
+        response = {'ResultsByTime': [{'Groups': [
+            {'Keys': [name], 'Metrics': {'UnblendedCost': {'Amount': amount}}}
+            for name, amount in self.pages[index]
+        ]}]}
+        if index + 1 < len(self.pages):
+            response['NextPageToken'] = str(index + 1)
+        return response
+
+
+class TestFetchAwsCosts:
+    """Tests for fetch_aws_costs function."""
+    
+    @pytest.fixture
+    def fake_ce(self, monkeypatch):
+        ce = _FakeCostExplorer()
+        monkeypatch.setattr(cost_fetcher, "_CE_CLIENT", ce)
+        monkeypatch.setattr(cost_fetcher, "_CT_CLIENT", _FakeCloudTrail())
+        monkeypatch.setattr(cost_fetcher, "_CE_CACHE", {"key": None, "data": None, "ts": 0.0})
+        return ce
+    
+    def test_parses_costs(self, fake_ce):
+        """Should total costs and skip zero-cost services."""
+        data = fetch_aws_costs()
+        assert data.month_to_date == 12.5
+        assert data.top_services == [("Amazon S3", 12.5, len("s3.amazonaws.com"))]
+    
+    def test_uses_given_timestamp(self, fake_ce):
+        """Date range and last_updated should both derive from `now`."""
+        now = datetime(2026, 3, 1, 12, 30)
+        data = fetch_aws_costs(now)
+        assert fake_ce.time_period == {'Start': '2026-03-01', 'End': '2026-03-02'}
+        assert data.last_updated == now
+    
+    def test_follows_next_page_token(self, fake_ce):
+        """Services spread over several pages should all be counted."""
+        fake_ce.pages = [[('Amazon S3', '12.5')], [('Amazon EC2', '40.0')]]
+        data = fetch_aws_costs()
+        assert fake_ce.calls == 2
+        assert data.month_to_date == 52.5
+        assert [name for name, _, _ in data.top_services] == ["Amazon EC2", "Amazon S3"]
+    
+    def test_repeat_fetch_served_from_cache(self, fake_ce):
+        """Fetches within CE_TTL should not query Cost Explorer again."""
+        fetch_aws_costs()
+        fetch_aws_costs()
+        assert fake_ce.calls == 1
+    
+    def test_expired_cache_refetches(self, fake_ce, monkeypatch):
+        """Fetches after CE_TTL should query Cost Explorer again."""
+        fetch_aws_costs()
+        monkeypatch.setattr(cost_fetcher, "CE_TTL", 0)
+        fetch_aws_costs()
+        assert fake_ce.calls == 2
 
 
 # Property-Based Tests
@@ -118,23 +281,11 @@ class TestCurrencyFormattingProperty:
     a string that starts with "$" and contains exactly two decimal places.
     """
     
-    @settings(max_examples=100)
-    @given(st.floats(min_value=0, max_value=1e9, allow_nan=False, allow_infinity=False))
-    def test_currency_format_starts_with_dollar(self, amount):
-        """Currency format should always start with $ symbol."""
+    @given(st.floats(min_value=0, max_value=1e9))
+    def test_currency_format(self, amount):
+        """Currency format should be "$" followed by digits and exactly two decimals."""
         result = format_currency(amount)
-        assert result.startswith("$"), f"Expected '$' prefix, got: {result}"
-    
-    @settings(max_examples=100)
-    @given(st.floats(min_value=0, max_value=1e9, allow_nan=False, allow_infinity=False))
-    def test_currency_format_has_two_decimals(self, amount):
-        """Currency format should always have exactly two decimal places."""
-        result = format_currency(amount)
-        # Remove $ and check decimal places
-        numeric_part = result[1:]
-        assert "." in numeric_part, f"Expected decimal point, got: {result}"
-        decimal_places = len(numeric_part.split(".")[1])
-        assert decimal_places == 2, f"Expected 2 decimal places, got {decimal_places} in: {result}"
+        assert _CURRENCY_RE.match(result), f"Expected $<digits>.<2 digits>, got: {result}"
 
 
 class TestTopServicesProperty:
@@ -147,52 +298,27 @@ class TestTopServicesProperty:
     contains both service name and cost.
     """
     
-    @settings(max_examples=100)
     @given(st.lists(
         st.tuples(
-            st.text(min_size=1, max_size=50),
-            st.floats(min_value=0, max_value=1e6, allow_nan=False, allow_infinity=False)
+            st.just("s"),  # names are opaque to get_top_services; only costs vary
+            st.floats(min_value=0, max_value=1e6)
         ),
         min_size=0,
         max_size=20
     ))
-    def test_top_services_returns_at_most_10(self, services):
-        """Should return at most 10 services."""
+    def test_top_services_invariants(self, services):
+        """Should return at most 10 (name, cost) tuples sorted by cost descending."""
         result = get_top_services(services)
+        
         assert len(result) <= 10, f"Expected at most 10 services, got {len(result)}"
-    
-    @settings(max_examples=100)
-    @given(st.lists(
-        st.tuples(
-            st.text(min_size=1, max_size=50),
-            st.floats(min_value=0, max_value=1e6, allow_nan=False, allow_infinity=False)
-        ),
-        min_size=0,
-        max_size=20
-    ))
-    def test_top_services_sorted_descending(self, services):
-        """Services should be sorted by cost in descending order."""
-        result = get_top_services(services)
-        if len(result) > 1:
-            costs = [cost for _, cost in result]
-            for i in range(len(costs) - 1):
-                assert costs[i] >= costs[i + 1], f"Services not sorted descending: {costs}"
-    
-    @settings(max_examples=100)
-    @given(st.lists(
-        st.tuples(
-            st.text(min_size=1, max_size=50),
-            st.floats(min_value=0, max_value=1e6, allow_nan=False, allow_infinity=False)
-        ),
-        min_size=0,
-        max_size=20
-    ))
-    def test_top_services_contain_name_and_cost(self, services):
-        """Each entry should contain service name (str) and cost (float)."""
-        result = get_top_services(services)
+        
         for entry in result:
             assert isinstance(entry, tuple), f"Expected tuple, got {type(entry)}"
             assert len(entry) == 2, f"Expected 2 elements, got {len(entry)}"
             name, cost = entry
             assert isinstance(name, str), f"Expected str name, got {type(name)}"
             assert isinstance(cost, float), f"Expected float cost, got {type(cost)}"
+        
+        costs = [cost for _, cost in result]
+        for i in range(len(costs) - 1):
+            assert costs[i] >= costs[i + 1], f"Services not sorted descending: {costs}"
@@ -0,0 +1,143 @@
+"""Tests for the update scheduler."""
+
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+from cost_fetcher import CostData, load_cached_costs
+from scheduler import POLL_INTERVAL_MS, UpdateScheduler
+
+
+_SAMPLE_DATA = CostData(
+    month_to_date=42.0,
+    top_services=[("Amazon EC2", 42.0, 3)],
+    last_updated=datetime(2026, 3, 14, 9, 26, 53)
+)
+
+
+class _FakeRoot:
+    """Records after() calls instead of running a Tk event loop."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def after(self, ms, func, *args):
+        self.calls.append((ms, func, args))
+        return len(self.calls)
+    
+    def after_cancel(self, after_id):
+        pass
+
+
+class _FakeWidget:
+    """Minimal stand-in for AWSCostWidget."""
+    
+    def __init__(self):
+        self.root = _FakeRoot()
+        self.displayed = []
+    
+    def update_display(self, cost_data):
+        self.displayed.append(cost_data)
+
+
+class TestStart:
+    """Tests for UpdateScheduler.start."""
+    
+    def test_initial_data_saved_to_cache(self, tmp_path):
+        """Startup data should be shown and cached without waiting for a refresh."""
+        widget = _FakeWidget()
+        cache_path = str(tmp_path / "last.json")
+        scheduler = UpdateScheduler(widget, lambda: _SAMPLE_DATA, 300,
+                                    initial_data=_SAMPLE_DATA, cache_path=cache_path)
+        scheduler.start()
+        try:
+            assert widget.displayed == [_SAMPLE_DATA]
+            assert load_cached_costs(cache_path, now=_SAMPLE_DATA.last_updated) == _SAMPLE_DATA
+            assert widget.root.calls[0][0] == 300 * 1000
+        finally:
+            scheduler.stop()
+
+
+def _failed_future(error):
+    future = Future()
+    future.set_exception(error)
+    return future
+
+
+class TestFirstError:
+    """Tests for the on_first_error hook."""
+    
+    def test_called_once_on_first_failure(self):
+        """Only the first failed fetch should reach the hook."""
+        errors = []
+        scheduler = UpdateScheduler(_FakeWidget(), lambda: _SAMPLE_DATA, 300,
+                                    on_first_error=errors.append)
+        try:
+            for message in ("expired", "still expired"):
+                scheduler._future = _failed_future(RuntimeError(message))
+                scheduler._apply_update(scheduler._future)
+            assert [str(e) for e in errors] == ["expired"]
+        finally:
+            scheduler.stop()
+    
+    def test_not_called_after_successful_first_fetch(self):
+        """A later failure after a good first fetch should only be logged."""
+        errors = []
+        widget = _FakeWidget()
+        scheduler = UpdateScheduler(widget, lambda: _SAMPLE_DATA, 300,
+                                    on_first_error=errors.append)
+        try:
+            scheduler._future = Future()
+            scheduler._future.set_result(_SAMPLE_DATA)
+            scheduler._apply_update(scheduler._future)
+            scheduler._future = _failed_future(RuntimeError("network"))
+            scheduler._apply_update(scheduler._future)
+            assert widget.displayed == [_SAMPLE_DATA]
+            assert errors == []
+        finally:
+            scheduler.stop()
+
+
+class TestPerformUpdate:
+    """Tests for applying background fetches from the Tk thread."""
+    
+    def test_polls_until_fetch_done(self):
+        """The result should be applied by a Tk-side poll, then the next refresh scheduled."""
+        release = threading.Event()
+        
+        def fetcher():
+            release.wait(5)
+            return _SAMPLE_DATA
+        
+        widget = _FakeWidget()
+        scheduler = UpdateScheduler(widget, fetcher, 300)
+        try:
+            scheduler.perform_update()
+            ms, poll, args = widget.root.calls[-1]
+            assert (ms, poll) == (POLL_INTERVAL_MS, scheduler._poll)
+            assert widget.displayed == []
+            
+            release.set()
+            args[0].result(timeout=5)
+            poll(*args)
+            assert widget.displayed == [_SAMPLE_DATA]
+            assert widget.root.calls[-1][:2] == (300 * 1000, scheduler.perform_update)
+        finally:
+            scheduler.stop()
+    
+    def test_stop_cancels_pending_poll(self):
+        """Stopping mid-fetch should cancel the poll and drop the result."""
+        release = threading.Event()
+        widget = _FakeWidget()
+        widget.root.cancelled = []
+        widget.root.after_cancel = widget.root.cancelled.append
+        scheduler = UpdateScheduler(widget, lambda: release.wait(5) and _SAMPLE_DATA, 300)
+        scheduler.perform_update()
+        future = widget.root.calls[-1][2][0]
+        scheduler.stop()
+        release.set()
+        future.result(timeout=5)
+        
+        assert widget.root.cancelled == [len(widget.root.calls)]
+        scheduler._poll(future)
+        assert widget.displayed == []